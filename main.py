@@ -1,104 +1,369 @@
+import atexit
+import bisect
 import json
 import os
+import re
 import sys
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# orjson is optional; it is much faster than the stdlib json module
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Dict:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Dict) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_line(obj: Dict) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _json_loads(data: bytes) -> Dict:
+        return json.loads(data)
+
+    def _json_dumps(obj: Dict) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    def _json_line(obj: Dict) -> bytes:
+        return (json.dumps(obj) + "\n").encode("utf-8")
+
+# ijson is optional; it is used to stream-parse large data files
+try:
+    import ijson
+    _LOAD_ERRORS: tuple = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _LOAD_ERRORS = (json.JSONDecodeError,)
+
+# Hours and day-type label for a request, indexed by int(is_half_day)
+_HOURS = (8, 4)
+_TYPE = ("Full Day", "Half Day")
+
+# Legacy data files larger than this (in bytes) are stream-parsed when ijson is available
+_STREAM_THRESHOLD = 1_000_000
+
+
+# Month and day may be one or two digits (as strptime allows); the year is always two
+_MMDDYY_RE = re.compile(r"(\d{1,2})-(\d{1,2})-(\d{2})", re.ASCII)
+
+
+@lru_cache(maxsize=4096)
+def _parse_mmddyy(date_str: str) -> Optional[str]:
+    """Validate a MM-DD-YY date string and return it as ISO (YYYY-MM-DD), or None."""
+    match = _MMDDYY_RE.fullmatch(date_str)
+    if not match:
+        return None
+    m, d, y = match.groups()
+    mi, di, yi = int(m), int(d), int(y)
+    if not (1 <= mi <= 12 and 1 <= di <= 31):
+        return None
+    # Same century pivot as strptime's %y: 69-99 -> 1900s, 00-68 -> 2000s
+    year = 1900 + yi if yi >= 69 else 2000 + yi
+    if di > 28:
+        # Only needed for calendar correctness (e.g. rejects 02-30-25), so
+        # datetime is imported here rather than at startup
+        from datetime import datetime
+        try:
+            datetime(year, mi, di)
+        except ValueError:
+            return None
+    return f"{year}-{m.zfill(2)}-{d.zfill(2)}"
+
+
+@lru_cache(maxsize=4096)
+def _format_iso_mmddyy(iso_date: str) -> str:
+    """Convert ISO date (YYYY-MM-DD) to display format (MM-DD-YY)."""
+    try:
+        y, m, d = iso_date.split("-")
+    except ValueError:
+        return iso_date  # Return as is if there's an error
+    return f"{m}-{d}-{y[-2:]}"
+
 
 class PTOManager:
-    def __init__(self, data_file="pto_data.json"):
+    def __init__(self, data_file="pto_data.json", meta_file="pto_meta.json",
+                 requests_file="pto_requests.jsonl"):
+        # Single-file format used by older versions; migrated on the next flush
         self.data_file = data_file
+        self.meta_file = meta_file
+        self.requests_file = requests_file
+        
+        # Requests are stored as index-aligned columns, sorted by ISO date
+        self._dates: List[str] = []
+        self._hours = array("B")
+        self._half = bytearray()
+        self._notes: List[str] = []
+        
+        # Set by mutations; flush() only rewrites the files that changed
+        self._meta_dirty = False
+        self._requests_dirty = False
+        # True when the requests file on disk had unreadable lines or an
+        # incomplete last line; it must be set aside and rewritten, not appended to
+        self._load_failed = False
+        
         self.data = self._load_data()
+        
+        # Used hours are derived from the requests rather than trusted from the file
+        self.data["used_pto_hours"] = sum(self._hours)
+        
+        # Prewarm the display-format cache with the dates the GUI is about to
+        # show; only the most recent ones fit in the cache
+        for date in self._dates[-_format_iso_mmddyy.cache_info().maxsize:]:
+            _format_iso_mmddyy(date)
     
     def _load_data(self) -> Dict:
-        """Load data from JSON file or create default structure if it doesn't exist."""
-        if os.path.exists(self.data_file):
+        """Load data from disk or create default structure if it doesn't exist.
+        
+        PTO requests are loaded into the request columns; the returned dict
+        only holds the remaining top-level fields.
+        """
+        if os.path.exists(self.meta_file) or os.path.exists(self.requests_file):
+            return self._load_jsonl()
+        elif os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                if ijson is not None and os.path.getsize(self.data_file) > _STREAM_THRESHOLD:
+                    data = self._stream_data()
+                else:
+                    with open(self.data_file, 'rb') as f:
+                        data = _json_loads(f.read())
+                    self._load_requests(data.pop("pto_requests", []))
+                # Write the data out in the current format on the next flush
+                self._meta_dirty = self._requests_dirty = True
+                return data
+            except _LOAD_ERRORS:
                 print(f"Error reading {self.data_file}, creating new data structure.")
+                self._clear_requests()
         
         # Default data structure
         return {
             "yearly_pto_hours": 0,
-            "used_pto_hours": 0,
-            "pto_requests": []
+            "used_pto_hours": 0
         }
     
-    def _save_data(self) -> None:
-        """Save data to JSON file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+    def _load_jsonl(self) -> Dict:
+        """Load the meta file and stream the one-request-per-line requests file.
+        
+        The two files are loaded independently, so a problem with one of them
+        doesn't throw away the data in the other.
+        """
+        data = {"yearly_pto_hours": 0, "used_pto_hours": 0}
+        if os.path.exists(self.meta_file):
+            try:
+                with open(self.meta_file, 'rb') as f:
+                    data = _json_loads(f.read())
+            except _LOAD_ERRORS:
+                print(f"Error reading {self.meta_file}, using default settings.")
+        
+        if os.path.exists(self.requests_file):
+            with open(self.requests_file, 'rb') as f:
+                self._load_requests(self._iter_request_lines(f))
+        return data
+    
+    def _iter_request_lines(self, f) -> Iterator[Dict]:
+        """Parse the requests file one line at a time, skipping bad lines.
+        
+        A bad line (typically an incomplete last line left by an interrupted
+        append) is skipped with a warning and the remaining requests are kept.
+        The file is then flagged so flush() sets it aside before rewriting it.
+        """
+        last_line = b""
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            last_line = line
+            try:
+                request = _json_loads(line)
+            except _LOAD_ERRORS:
+                request = None
+            if not (isinstance(request, dict) and "date" in request
+                    and "is_half_day" in request and "note" in request):
+                print(f"Skipping unreadable line {line_no} in {self.requests_file}.")
+                self._load_failed = True
+                continue
+            yield request
+        
+        if last_line and not last_line.endswith(b"\n"):
+            # Appending now would join the new line onto this one
+            self._load_failed = True
+    
+    def _stream_data(self) -> Dict:
+        """Stream-parse a large data file with ijson without building the full document."""
+        with open(self.data_file, 'rb') as f:
+            # yearly_pto_hours is written before pto_requests, so this stops early
+            yearly_pto_hours = next(ijson.items(f, "yearly_pto_hours", use_float=True), 0)
+            f.seek(0)
+            self._load_requests(ijson.items(f, "pto_requests.item", use_float=True))
+        return {"yearly_pto_hours": yearly_pto_hours}
+    
+    def _load_requests(self, requests: Iterable[Dict]) -> None:
+        """Append loaded requests to the columns and make sure they are sorted by date."""
+        for request in requests:
+            half = bool(request["is_half_day"])
+            self._dates.append(request["date"])
+            # Hours are fully determined by the half-day flag, so the stored
+            # value (which may be hand-edited, e.g. 8.0) isn't trusted
+            self._hours.append(_HOURS[half])
+            self._half.append(half)
+            self._notes.append(request["note"])
+        
+        # Compacted files are already sorted; appended or hand-edited ones may not be
+        dates = self._dates
+        if any(dates[i] > dates[i + 1] for i in range(len(dates) - 1)):
+            order = sorted(range(len(dates)), key=dates.__getitem__)
+            self._dates = [dates[i] for i in order]
+            self._hours = array("B", (self._hours[i] for i in order))
+            self._half = bytearray(self._half[i] for i in order)
+            self._notes = [self._notes[i] for i in order]
+    
+    def _clear_requests(self) -> None:
+        """Drop all requests from the columns."""
+        self._dates.clear()
+        del self._hours[:]
+        self._half.clear()
+        self._notes.clear()
+    
+    @staticmethod
+    def _request_row(date: str, hours: int, half: int, note: str) -> Dict:
+        """Build the persisted form of a request."""
+        return {"date": date, "is_half_day": bool(half), "hours": hours, "note": note}
+    
+    @staticmethod
+    def _replace_file(path: str, content: bytes) -> None:
+        """Write a file via a temp file so a crash can't leave it truncated."""
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_file, path)
+    
+    def _save_meta(self) -> None:
+        """Save the top-level fields to the meta file."""
+        # used_pto_hours is recomputed from the requests on load
+        data = {k: v for k, v in self.data.items() if k != "used_pto_hours"}
+        self._replace_file(self.meta_file, _json_dumps(data))
+    
+    def _save_requests(self) -> None:
+        """Rewrite (compact) the requests file from the columns."""
+        self._replace_file(self.requests_file, b"".join(
+            _json_line(self._request_row(*row))
+            for row in zip(self._dates, self._hours, self._half, self._notes)
+        ))
+    
+    def _append_request(self, i: int) -> None:
+        """Append the request at index i to the requests file."""
+        if self._requests_dirty or self._load_failed:
+            # Rewrite the whole file instead: a compaction is already pending,
+            # or the file on disk is damaged and must not be appended to
+            self._requests_dirty = True
+            return
+        row = self._request_row(self._dates[i], self._hours[i], self._half[i], self._notes[i])
+        with open(self.requests_file, 'ab') as f:
+            f.write(_json_line(row))
+    
+    def flush(self) -> None:
+        """Write pending changes to disk, if there are any."""
+        if self._meta_dirty:
+            self._save_meta()
+            self._meta_dirty = False
+        if self._requests_dirty:
+            if self._load_failed and os.path.exists(self.requests_file):
+                # Keep the damaged file around instead of overwriting it
+                bad_file = self.requests_file + ".bad"
+                os.replace(self.requests_file, bad_file)
+                print(f"Moved damaged {self.requests_file} to {bad_file}.")
+            self._save_requests()
+            self._requests_dirty = False
+            # The file has been rewritten cleanly, so appends are safe again
+            self._load_failed = False
+    
+    def _find_request(self, iso_date: str) -> Optional[int]:
+        """Return the index of the request for an ISO date, or None if there isn't one."""
+        i = bisect.bisect_left(self._dates, iso_date)
+        if i < len(self._dates) and self._dates[i] == iso_date:
+            return i
+        return None
+    
+    def _request_at(self, i: int) -> Dict:
+        """Build the request dict for the request at index i."""
+        return {
+            "date": self._dates[i],
+            "is_half_day": bool(self._half[i]),
+            "hours": self._hours[i],
+            "note": self._notes[i]
+        }
+    
+    def _insert_request(self, date: str, hours: int, is_half_day: bool, note: str) -> int:
+        """Insert a request in date order and return its index."""
+        i = bisect.bisect_left(self._dates, date)
+        self._dates.insert(i, date)
+        self._hours.insert(i, hours)
+        self._half.insert(i, is_half_day)
+        self._notes.insert(i, note)
+        return i
+    
+    def _delete_request(self, i: int) -> None:
+        """Delete the request at index i."""
+        del self._dates[i]
+        del self._hours[i]
+        del self._half[i]
+        del self._notes[i]
     
     def _validate_date(self, date_str: str) -> Optional[str]:
         """Validate and normalize date string in MM-DD-YY format."""
-        try:
-            # Parse the MM-DD-YY format
-            date_obj = datetime.strptime(date_str, "%m-%d-%y")
-            # Store as ISO format for consistent sorting (YYYY-MM-DD)
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            return None
+        return _parse_mmddyy(date_str)
     
     def _format_date_for_display(self, iso_date: str) -> str:
         """Convert ISO date (YYYY-MM-DD) to display format (MM-DD-YY)."""
-        try:
-            date_obj = datetime.strptime(iso_date, "%Y-%m-%d")
-            return date_obj.strftime("%m-%d-%y")
-        except ValueError:
-            return iso_date  # Return as is if there's an error
+        return _format_iso_mmddyy(iso_date)
         
     def set_yearly_pto_hours(self, hours: float) -> None:
         """Set the total yearly PTO hours available."""
+        if self.data["yearly_pto_hours"] == hours:
+            print(f"Yearly PTO hours already set to {hours}.")
+            return
+        
         self.data["yearly_pto_hours"] = hours
-        self._save_data()
+        self._meta_dirty = True
         print(f"Yearly PTO hours set to {hours}.")
     
-    def add_pto_request(self, date: str, is_half_day: bool = False, note: str = "") -> None:
-        """Add a new PTO request."""
+    def add_pto_request(self, date: str, is_half_day: bool = False, note: str = "") -> Optional[str]:
+        """Add a new PTO request. Returns the ISO date added, or None on failure."""
         # Validate and normalize date
         normalized_date = self._validate_date(date)
         if not normalized_date:
             print("Invalid date format. Please use MM-DD-YY.")
-            return
+            return None
         
         # Check if date already exists
-        for request in self.data["pto_requests"]:
-            if request["date"] == normalized_date:
-                display_date = self._format_date_for_display(normalized_date)
-                print(f"A PTO request for {display_date} already exists. Use edit instead.")
-                return
-        
-        hours = 4 if is_half_day else 8
-        
-        # Create new request
-        new_request = {
-            "date": normalized_date,
-            "is_half_day": is_half_day,
-            "hours": hours,
-            "note": note
-        }
+        if self._find_request(normalized_date) is not None:
+            display_date = self._format_date_for_display(normalized_date)
+            print(f"A PTO request for {display_date} already exists. Use edit instead.")
+            return None
         
-        self.data["pto_requests"].append(new_request)
+        hours = _HOURS[is_half_day]
         
-        # Sort requests by date
-        self.data["pto_requests"].sort(key=lambda x: x["date"])
+        # Insert in date order
+        i = self._insert_request(normalized_date, hours, is_half_day, note)
         
         # Update used hours
         self.data["used_pto_hours"] += hours
         
-        self._save_data()
+        # New requests are appended to the requests file right away
+        self._append_request(i)
         display_date = self._format_date_for_display(normalized_date)
         print(f"Added PTO request for {display_date}.")
+        return normalized_date
     
     def edit_pto_request(self, date: str, new_date: Optional[str] = None, 
-                        is_half_day: Optional[bool] = None, note: Optional[str] = None) -> None:
-        """Edit an existing PTO request."""
+                        is_half_day: Optional[bool] = None, note: Optional[str] = None) -> Optional[str]:
+        """Edit an existing PTO request. Returns the request's ISO date after the edit, or None on failure."""
         # Validate and normalize the lookup date
         normalized_date = self._validate_date(date)
         if not normalized_date:
             print("Invalid date format for lookup date. Please use MM-DD-YY.")
-            return
+            return None
             
         # Validate and normalize the new date if provided
         normalized_new_date = None
@@ -106,74 +371,90 @@ class PTOManager:
             normalized_new_date = self._validate_date(new_date)
             if not normalized_new_date:
                 print("Invalid date format for new date. Please use MM-DD-YY.")
-                return
-        
-        for i, request in enumerate(self.data["pto_requests"]):
-            if request["date"] == normalized_date:
-                # Update the used hours count
-                old_hours = request["hours"]
-                
-                if normalized_new_date is not None:
-                    request["date"] = normalized_new_date
-                
-                if is_half_day is not None:
-                    request["is_half_day"] = is_half_day
-                    request["hours"] = 4 if is_half_day else 8
-                
-                if note is not None:
-                    request["note"] = note
-                
-                # Update the total used hours
-                self.data["used_pto_hours"] = self.data["used_pto_hours"] - old_hours + request["hours"]
-                
-                # Sort requests by date
-                self.data["pto_requests"].sort(key=lambda x: x["date"])
-                
-                self._save_data()
-                display_date = self._format_date_for_display(normalized_date)
-                print(f"Updated PTO request for {display_date}.")
-                return
+                return None
+        
+        i = self._find_request(normalized_date)
+        if i is None:
+            display_date = self._format_date_for_display(normalized_date)
+            print(f"No PTO request found for {display_date}.")
+            return None
+        
+        if (normalized_new_date is not None and normalized_new_date != normalized_date
+                and self._find_request(normalized_new_date) is not None):
+            display_date = self._format_date_for_display(normalized_new_date)
+            print(f"A PTO request for {display_date} already exists.")
+            return None
+        
+        # Nothing to do (and nothing to save) if every field is unchanged
+        if ((normalized_new_date is None or normalized_new_date == normalized_date)
+                and (is_half_day is None or bool(is_half_day) == bool(self._half[i]))
+                and (note is None or note == self._notes[i])):
+            display_date = self._format_date_for_display(normalized_date)
+            print(f"No changes to PTO request for {display_date}.")
+            return normalized_date
+        
+        # Update the used hours count
+        old_hours = self._hours[i]
+        
+        if is_half_day is not None:
+            self._half[i] = is_half_day
+            self._hours[i] = _HOURS[is_half_day]
+        
+        if note is not None:
+            self._notes[i] = note
+        
+        # Update the total used hours
+        self.data["used_pto_hours"] = self.data["used_pto_hours"] - old_hours + self._hours[i]
+        
+        if normalized_new_date is not None and normalized_new_date != normalized_date:
+            # Move the request to its new position in date order
+            hours, half, note = self._hours[i], self._half[i], self._notes[i]
+            self._delete_request(i)
+            self._insert_request(normalized_new_date, hours, half, note)
         
+        self._requests_dirty = True
         display_date = self._format_date_for_display(normalized_date)
-        print(f"No PTO request found for {display_date}.")
+        print(f"Updated PTO request for {display_date}.")
+        return normalized_new_date or normalized_date
     
-    def remove_pto_request(self, date: str) -> None:
-        """Remove a PTO request."""
+    def remove_pto_request(self, date: str) -> Optional[str]:
+        """Remove a PTO request. Returns the ISO date removed, or None on failure."""
         # Validate and normalize date
         normalized_date = self._validate_date(date)
         if not normalized_date:
             print("Invalid date format. Please use MM-DD-YY.")
-            return
+            return None
             
-        for i, request in enumerate(self.data["pto_requests"]):
-            if request["date"] == normalized_date:
-                # Update the used hours count
-                self.data["used_pto_hours"] -= request["hours"]
-                
-                # Remove the request
-                self.data["pto_requests"].pop(i)
-                
-                self._save_data()
-                display_date = self._format_date_for_display(normalized_date)
-                print(f"Removed PTO request for {display_date}.")
-                return
+        i = self._find_request(normalized_date)
+        if i is None:
+            display_date = self._format_date_for_display(normalized_date)
+            print(f"No PTO request found for {display_date}.")
+            return None
+        
+        # Update the used hours count
+        self.data["used_pto_hours"] -= self._hours[i]
+        
+        # Remove the request
+        self._delete_request(i)
         
+        self._requests_dirty = True
         display_date = self._format_date_for_display(normalized_date)
-        print(f"No PTO request found for {display_date}.")
+        print(f"Removed PTO request for {display_date}.")
+        return normalized_date
     
     def list_pto_requests(self) -> None:
         """List all PTO requests."""
-        if not self.data["pto_requests"]:
+        if not self._dates:
             print("No PTO requests found.")
             return
         
         print("\nCurrent PTO Requests:")
         print("=" * 50)
-        for request in self.data["pto_requests"]:
-            day_type = "Half Day" if request["is_half_day"] else "Full Day"
-            display_date = self._format_date_for_display(request["date"])
-            note_str = f" - Note: {request['note']}" if request["note"] else ""
-            print(f"{display_date} - {day_type} ({request['hours']} hours){note_str}")
+        for date, hours, half, note in zip(self._dates, self._hours, self._half, self._notes):
+            day_type = _TYPE[half]
+            display_date = _format_iso_mmddyy(date)
+            note_str = f" - Note: {note}" if note else ""
+            print(f"{display_date} - {day_type} ({hours} hours){note_str}")
         print("=" * 50)
     
     def show_summary(self) -> None:
@@ -198,6 +479,7 @@ def run_gui():
         sys.exit(1)
     
     pto = PTOManager()
+    atexit.register(pto.flush)
     
     # Main window
     root = tk.Tk()
@@ -257,28 +539,55 @@ def run_gui():
     btn_frame = ttk.Frame(root, padding="10")
     btn_frame.pack(fill=tk.X, padx=10, pady=5)
     
-    def update_display():
-        """Update the display with current data."""
-        # Clear current tree items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Update summary variables
+    # Tree item id for each displayed request, keyed by ISO date
+    tree_items: Dict[str, str] = {}
+    
+    def row_values(i):
+        """Build the Treeview values for the request at index i."""
+        return (
+            _format_iso_mmddyy(pto._dates[i]),
+            _TYPE[pto._half[i]],
+            f"{pto._hours[i]} hrs",
+            pto._notes[i]
+        )
+    
+    def update_summary():
+        """Update the summary labels with current data."""
         yearly_pto_var.set(f"{pto.data['yearly_pto_hours']} hours")
         used_pto_var.set(f"{pto.data['used_pto_hours']} hours")
         remaining = pto.data['yearly_pto_hours'] - pto.data['used_pto_hours']
         remaining_pto_var.set(f"{remaining} hours")
+    
+    def update_display():
+        """Rebuild the whole display from current data."""
+        update_summary()
+        
+        # Clear current tree items in a single call
+        tree.delete(*tree.get_children())
+        tree_items.clear()
+        
+        # Add PTO requests to tree, building rows straight from the columns
+        for i, date in enumerate(pto._dates):
+            tree_items[date] = tree.insert("", tk.END, values=row_values(i))
+    
+    def update_rows(*iso_dates):
+        """Insert, update or delete only the tree rows for the given dates."""
+        for iso_date in iso_dates:
+            index = pto._find_request(iso_date)
+            item = tree_items.get(iso_date)
+            if index is None:
+                if item is not None:
+                    tree.delete(item)
+                    del tree_items[iso_date]
+                continue
+            
+            if item is None:
+                tree_items[iso_date] = tree.insert("", index, values=row_values(index))
+            else:
+                tree.item(item, values=row_values(index))
+                tree.move(item, "", index)
         
-        # Add PTO requests to tree
-        for request in pto.data["pto_requests"]:
-            day_type = "Half Day" if request["is_half_day"] else "Full Day"
-            display_date = pto._format_date_for_display(request["date"])
-            tree.insert("", tk.END, values=(
-                display_date,
-                day_type,
-                f"{request['hours']} hrs",
-                request["note"]
-            ))
+        update_summary()
     
     def set_yearly_pto():
         """Set the yearly PTO hours."""
@@ -286,45 +595,80 @@ def run_gui():
                                      minvalue=0, initialvalue=pto.data["yearly_pto_hours"])
         if hours is not None:
             pto.set_yearly_pto_hours(hours)
-            update_display()
+            update_summary()
+    
+    # Add/Edit dialogs are built once, then hidden and re-shown instead of recreated
+    request_windows: Dict[str, Dict] = {}
+    
+    def show_request_window(title, button_text, date, is_half_day, note, on_submit):
+        """Show the cached request dialog for title, building it on first use."""
+        form = request_windows.get(title)
+        if form is None:
+            window = tk.Toplevel(root)
+            window.withdraw()
+            window.title(title)
+            window.geometry("400x200")
+            window.transient(root)
+
+            window.columnconfigure(0, weight=0)  # Label column stays fixed width
+            window.columnconfigure(1, weight=1)  # Entry column expands to fill space
+            
+            ttk.Label(window, text="Date (MM-DD-YY):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+            date_entry = ttk.Entry(window, width=20)
+            date_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
+            
+            is_half_day_var = tk.BooleanVar()
+            ttk.Checkbutton(window, text="Half Day", variable=is_half_day_var).grid(
+                row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+            
+            ttk.Label(window, text="Note:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+            note_entry = ttk.Entry(window, width=30)
+            note_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
+            
+            form = {
+                "window": window,
+                "date_entry": date_entry,
+                "is_half_day_var": is_half_day_var,
+                "note_entry": note_entry,
+                "on_submit": None
+            }
+            
+            def submit():
+                form["on_submit"](date_entry.get().strip(), is_half_day_var.get(), note_entry.get().strip())
+            
+            ttk.Button(window, text=button_text, command=submit).grid(
+                row=3, column=0, columnspan=2, pady=15)
+            
+            # Closing the dialog only hides it so it can be reused
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            request_windows[title] = form
+        
+        # Reset the fields for this use of the dialog
+        form["date_entry"].delete(0, tk.END)
+        form["date_entry"].insert(0, date)
+        form["is_half_day_var"].set(is_half_day)
+        form["note_entry"].delete(0, tk.END)
+        form["note_entry"].insert(0, note)
+        form["on_submit"] = on_submit
+        
+        form["window"].deiconify()
+        form["window"].lift()
+        form["date_entry"].focus_set()
+        return form["window"]
     
     def add_pto():
         """Add a new PTO request."""
-        add_window = tk.Toplevel(root)
-        add_window.title("Add PTO Request")
-        add_window.geometry("400x200")
-        add_window.transient(root)
-
-        add_window.columnconfigure(0, weight=0)  # Label column stays fixed width
-        add_window.columnconfigure(1, weight=1)  # Entry column expands to fill space
-        
-        ttk.Label(add_window, text="Date (MM-DD-YY):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        date_entry = ttk.Entry(add_window, width=20)
-        date_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        is_half_day_var = tk.BooleanVar()
-        ttk.Checkbutton(add_window, text="Half Day", variable=is_half_day_var).grid(
-            row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
-        
-        ttk.Label(add_window, text="Note:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        note_entry = ttk.Entry(add_window, width=30)
-        note_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        def submit():
-            date = date_entry.get().strip()
-            is_half_day = is_half_day_var.get()
-            note = note_entry.get().strip()
-            
+        def submit(date, is_half_day, note):
             normalized_date = pto._validate_date(date)
             if normalized_date:
-                pto.add_pto_request(date, is_half_day, note)
-                add_window.destroy()
-                update_display()
+                added_date = pto.add_pto_request(date, is_half_day, note)
+                add_window.withdraw()
+                if added_date:
+                    update_rows(added_date)
             else:
                 messagebox.showerror("Error", "Invalid date format. Please use MM-DD-YY.")
         
-        ttk.Button(add_window, text="Add", command=submit).grid(
-            row=3, column=0, columnspan=2, pady=15)
+        add_window = show_request_window("Add PTO Request", "Add", "", False, "", submit)
     
     def edit_pto():
         """Edit a selected PTO request."""
@@ -338,56 +682,25 @@ def run_gui():
         display_date = item_values[0]
         
         # Convert to ISO format to find in the data
-        orig_date_obj = datetime.strptime(display_date, "%m-%d-%y")
-        iso_date = orig_date_obj.strftime("%Y-%m-%d")
-        
-        # Find the request data
-        request_data = None
-        for req in pto.data["pto_requests"]:
-            if req["date"] == iso_date:
-                request_data = req
-                break
+        iso_date = pto._validate_date(display_date)
+        index = pto._find_request(iso_date) if iso_date else None
+        request_data = pto._request_at(index) if index is not None else None
         
         if not request_data:
             messagebox.showerror("Error", "Could not find request data.")
             return
         
-        edit_window = tk.Toplevel(root)
-        edit_window.title("Edit PTO Request")
-        edit_window.geometry("400x200")
-        edit_window.transient(root)
-
-        edit_window.columnconfigure(0, weight=0)  # Label column stays fixed width
-        edit_window.columnconfigure(1, weight=1)  # Entry column expands to fill space
-        
-        ttk.Label(edit_window, text="Date (MM-DD-YY):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        date_entry = ttk.Entry(edit_window, width=20)
-        date_entry.insert(0, display_date)
-        date_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        is_half_day_var = tk.BooleanVar(value=request_data["is_half_day"])
-        ttk.Checkbutton(edit_window, text="Half Day", variable=is_half_day_var).grid(
-            row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
-        
-        ttk.Label(edit_window, text="Note:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        note_entry = ttk.Entry(edit_window, width=30)
-        note_entry.insert(0, request_data["note"])
-        note_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        def submit():
-            new_date = date_entry.get().strip()
-            is_half_day = is_half_day_var.get()
-            note = note_entry.get().strip()
-            
+        def submit(new_date, is_half_day, note):
             if pto._validate_date(new_date):
-                pto.edit_pto_request(display_date, new_date, is_half_day, note)
-                edit_window.destroy()
-                update_display()
+                edited_date = pto.edit_pto_request(display_date, new_date, is_half_day, note)
+                edit_window.withdraw()
+                if edited_date:
+                    update_rows(iso_date, edited_date)
             else:
                 messagebox.showerror("Error", "Invalid date format. Please use MM-DD-YY.")
         
-        ttk.Button(edit_window, text="Update", command=submit).grid(
-            row=3, column=0, columnspan=2, pady=15)
+        edit_window = show_request_window("Edit PTO Request", "Update", display_date,
+                                          request_data["is_half_day"], request_data["note"], submit)
     
     def remove_pto():
         """Remove a selected PTO request."""
@@ -401,8 +714,9 @@ def run_gui():
         display_date = item_values[0]
         
         if messagebox.askyesno("Confirm", f"Are you sure you want to remove the PTO request for {display_date}?"):
-            pto.remove_pto_request(display_date)
-            update_display()
+            removed_date = pto.remove_pto_request(display_date)
+            if removed_date:
+                update_rows(removed_date)
     
     # Create buttons
     ttk.Button(btn_frame, text="Set Yearly PTO", command=set_yearly_pto).pack(side=tk.LEFT, padx=5)
@@ -410,7 +724,13 @@ def run_gui():
     ttk.Button(btn_frame, text="Edit PTO", command=edit_pto).pack(side=tk.LEFT, padx=5)
     ttk.Button(btn_frame, text="Remove PTO", command=remove_pto).pack(side=tk.LEFT, padx=5)
     ttk.Button(btn_frame, text="Refresh", command=update_display).pack(side=tk.LEFT, padx=5)
-    ttk.Button(btn_frame, text="Exit", command=root.destroy).pack(side=tk.RIGHT, padx=5)
+    def exit_app():
+        """Save pending changes and close the window."""
+        pto.flush()
+        root.destroy()
+    
+    ttk.Button(btn_frame, text="Exit", command=exit_app).pack(side=tk.RIGHT, padx=5)
+    root.protocol("WM_DELETE_WINDOW", exit_app)
     
     # Initial display update
     update_display()
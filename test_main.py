@@ -0,0 +1,210 @@
+import json
+
+from main import PTOManager, _format_iso_mmddyy, _parse_mmddyy
+
+
+def make_manager(tmp_path):
+    """Create a PTOManager whose files all live under tmp_path."""
+    return PTOManager(
+        meta_file=str(tmp_path / "pto_meta.json"),
+        requests_file=str(tmp_path / "pto_requests.jsonl"),
+        data_file=str(tmp_path / "pto_data.json"),
+    )
+
+
+def read_lines(tmp_path):
+    """Return the parsed lines of the requests file."""
+    with open(tmp_path / "pto_requests.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_legacy_file_migrates_on_flush(tmp_path):
+    legacy = {
+        "yearly_pto_hours": 120,
+        "used_pto_hours": 999,
+        "pto_requests": [
+            {"date": "2025-02-03", "is_half_day": True, "hours": 4, "note": "dentist"},
+            {"date": "2025-01-02", "is_half_day": False, "hours": 8, "note": ""},
+        ],
+    }
+    (tmp_path / "pto_data.json").write_text(json.dumps(legacy))
+
+    pto = make_manager(tmp_path)
+    pto.flush()
+
+    reloaded = make_manager(tmp_path)
+    assert reloaded.data == {"yearly_pto_hours": 120, "used_pto_hours": 12}
+    assert reloaded._dates == ["2025-01-02", "2025-02-03"]
+    assert list(reloaded._half) == [0, 1]
+    assert reloaded._notes == ["", "dentist"]
+    assert read_lines(tmp_path) == sorted(legacy["pto_requests"], key=lambda r: r["date"])
+
+
+def test_add_appends_after_compaction(tmp_path):
+    pto = make_manager(tmp_path)
+    pto.add_pto_request("01-02-25")
+    pto.add_pto_request("01-03-25")
+    pto.edit_pto_request("01-03-25", note="moved")
+    pto.flush()
+    assert not pto._requests_dirty
+
+    pto.add_pto_request("01-01-25", is_half_day=True)
+
+    # Appended as a new last line without another rewrite
+    assert not pto._requests_dirty
+    assert [r["date"] for r in read_lines(tmp_path)] == ["2025-01-02", "2025-01-03", "2025-01-01"]
+    reloaded = make_manager(tmp_path)
+    assert reloaded._dates == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert reloaded._notes == ["", "", "moved"]
+
+
+def test_add_while_compaction_pending_marks_dirty(tmp_path):
+    pto = make_manager(tmp_path)
+    pto.add_pto_request("01-02-25")
+    pto.remove_pto_request("01-02-25")
+    assert pto._requests_dirty
+
+    pto.add_pto_request("01-02-25", is_half_day=True)
+
+    # The file still holds only the original line until flush() compacts it
+    assert read_lines(tmp_path) == [
+        {"date": "2025-01-02", "is_half_day": False, "hours": 8, "note": ""}
+    ]
+    pto.flush()
+    assert read_lines(tmp_path) == [
+        {"date": "2025-01-02", "is_half_day": True, "hours": 4, "note": ""}
+    ]
+
+
+def test_torn_last_line_keeps_other_requests(tmp_path):
+    pto = make_manager(tmp_path)
+    pto.set_yearly_pto_hours(80)
+    for date in ("01-01-25", "01-02-25", "01-03-25"):
+        pto.add_pto_request(date)
+    pto.flush()
+    with open(tmp_path / "pto_requests.jsonl", "a") as f:
+        f.write('{"date": "2025-')
+
+    pto = make_manager(tmp_path)
+    assert pto.data["yearly_pto_hours"] == 80
+    assert pto._dates == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+    # The next add rewrites the file rather than appending to the torn line
+    pto.add_pto_request("01-04-25")
+    assert pto._requests_dirty
+    pto.flush()
+    assert len(read_lines(tmp_path)) == 4
+    assert not pto._load_failed
+
+
+def test_bad_middle_line_keeps_other_requests(tmp_path):
+    pto = make_manager(tmp_path)
+    for date in ("01-01-25", "01-02-25", "01-03-25"):
+        pto.add_pto_request(date)
+    pto.flush()
+    path = tmp_path / "pto_requests.jsonl"
+    lines = path.read_text().splitlines(keepends=True)
+    lines[1] = "{not json\n"
+    path.write_text("".join(lines))
+
+    pto = make_manager(tmp_path)
+    assert pto._dates == ["2025-01-01", "2025-01-03"]
+
+    pto.add_pto_request("02-01-25")
+    pto.flush()
+
+    # The valid requests survive the rewrite and the damaged file is kept aside
+    assert [r["date"] for r in read_lines(tmp_path)] == ["2025-01-01", "2025-01-03", "2025-02-01"]
+    assert (tmp_path / "pto_requests.jsonl.bad").read_text() == "".join(lines)
+
+
+def test_positional_data_file_is_legacy_file(tmp_path):
+    legacy = tmp_path / "my.json"
+    legacy.write_text(json.dumps({
+        "yearly_pto_hours": 40,
+        "pto_requests": [{"date": "2025-01-02", "is_half_day": False, "hours": 8, "note": ""}],
+    }))
+
+    pto = PTOManager(
+        str(legacy),
+        meta_file=str(tmp_path / "pto_meta.json"),
+        requests_file=str(tmp_path / "pto_requests.jsonl"),
+    )
+    assert pto.data["yearly_pto_hours"] == 40
+    assert pto._dates == ["2025-01-02"]
+
+
+def test_parse_accepts_one_digit_month_and_day():
+    assert _parse_mmddyy("1-2-25") == "2025-01-02"
+    assert _parse_mmddyy("01-02-25") == "2025-01-02"
+
+
+def test_parse_century_pivot_matches_strptime():
+    assert _parse_mmddyy("01-01-68") == "2068-01-01"
+    assert _parse_mmddyy("01-01-69") == "1969-01-01"
+
+
+def test_parse_checks_days_in_month():
+    assert _parse_mmddyy("02-29-24") == "2024-02-29"
+    assert _parse_mmddyy("02-29-25") is None
+    assert _parse_mmddyy("04-31-25") is None
+
+
+def test_parse_rejects_malformed_input():
+    assert _parse_mmddyy("\uff11-02-25") is None  # fullwidth digit one
+    assert _parse_mmddyy("01-02-2025") is None
+    # strptime allowed a space-padded day here; the fast parser does not
+    assert _parse_mmddyy("01- 1-25") is None
+
+
+def test_format_round_trip():
+    assert _format_iso_mmddyy("2025-01-02") == "01-02-25"
+    assert _parse_mmddyy(_format_iso_mmddyy("1999-12-31")) == "1999-12-31"
+
+
+def test_edit_onto_existing_date_is_refused(tmp_path):
+    pto = make_manager(tmp_path)
+    pto.add_pto_request("01-02-25", note="first")
+    pto.add_pto_request("01-03-25", is_half_day=True, note="second")
+
+    assert pto.edit_pto_request("01-03-25", new_date="01-02-25") is None
+
+    # Both requests are untouched
+    assert pto._dates == ["2025-01-02", "2025-01-03"]
+    assert pto._notes == ["first", "second"]
+    assert pto.data["used_pto_hours"] == 12
+
+
+def test_used_hours_recomputed_from_requests(tmp_path):
+    (tmp_path / "pto_data.json").write_text(json.dumps({
+        "yearly_pto_hours": 80,
+        "used_pto_hours": 999,
+        "pto_requests": [
+            {"date": "2025-01-02", "is_half_day": False, "hours": 8, "note": ""},
+            {"date": "2025-01-03", "is_half_day": True, "hours": 4, "note": ""},
+        ],
+    }))
+
+    pto = make_manager(tmp_path)
+    assert pto.data["used_pto_hours"] == 12
+
+    # Not persisted, so it can't drift from the requests again
+    pto.flush()
+    meta = json.loads((tmp_path / "pto_meta.json").read_text())
+    assert "used_pto_hours" not in meta
+
+
+def test_no_op_edits_do_not_mark_dirty(tmp_path):
+    pto = make_manager(tmp_path)
+    pto.set_yearly_pto_hours(80)
+    pto.add_pto_request("01-02-25", is_half_day=True, note="dentist")
+    pto.flush()
+
+    pto.set_yearly_pto_hours(80)
+    assert not pto._meta_dirty
+
+    assert pto.edit_pto_request("01-02-25", "01-02-25", True, "dentist") == "2025-01-02"
+    assert not pto._requests_dirty
+
+    pto.edit_pto_request("01-02-25", note="doctor")
+    assert pto._requests_dirty